@@ -9,16 +9,25 @@ Usage:
     python check_api_status.py --providers openai groq  # Specific providers
     python check_api_status.py --save             # Save report to file
     python check_api_status.py --threshold 10.0   # Custom low-balance warning ($)
+    python check_api_status.py --timeout 5        # Per-provider timeout (seconds)
 """
 
 import asyncio
+import copy
+import hashlib
 import json
 import os
 import sys
+import time
+import weakref
 import argparse
-from datetime import datetime, timezone
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from enum import IntEnum
+from functools import lru_cache, partial, wraps
+from operator import itemgetter
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterator, Optional
 
 try:
     import httpx
@@ -32,15 +41,48 @@ try:
 except ImportError:
     pass  # python-dotenv optional
 
+try:
+    import h2  # noqa: F401
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False  # h2 optional — falls back to HTTP/1.1
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # orjson optional — falls back to stdlib json
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None  # zstandard optional — saved JSON is written uncompressed
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None  # uvloop optional — falls back to the stdlib event loop
+
 
 # ─────────────────────────────────────────────
 # Configuration
 # ─────────────────────────────────────────────
 
-TIMEOUT = 10.0  # seconds per request
+TIMEOUT = 10.0  # seconds per request, unless run_checks() is given a provider timeout
+PROVIDER_TIMEOUT = 10.0  # seconds for one provider's whole check (all of its requests)
+BATCH_TIMEOUT_FACTOR = 1.5  # a whole run_checks() sweep is capped at this × the provider timeout
+CONNECT_TIMEOUT = 5.0
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE = 20
+MAX_PER_HOST = 4  # concurrent requests to any one host; no checker issues more than 3 at once
 DEFAULT_WARN_BALANCE_USD = 5.00
 DEFAULT_WARN_USAGE_PCT = 80
 CNY_TO_USD = 0.138  # approximate, for display purposes
+CACHE_TTL = 30.0  # seconds a result is reused by run_checks_cached()
+DISK_CACHE_TTL = 60.0  # seconds a CLI result is reused from disk between runs
+BALANCE_CACHE_TTL = 5.0  # cap for results carrying a balance, which moves faster
+REPORTS_DIR = Path.home() / "openclaw" / "reports"
+CACHE_DIR = REPORTS_DIR / ".cache"
+SAVE_ZSTD_LEVEL = 1  # saved JSON reports are zstd-compressed when zstandard is installed
 
 PROVIDERS_CONFIG = {
     "anthropic":   {"env": "ANTHROPIC_API_KEY",    "label": "Anthropic"},
@@ -58,17 +100,30 @@ PROVIDERS_CONFIG = {
     "huggingface": {"env": "HUGGINGFACE_API_KEY",   "label": "Hugging Face"},
 }
 
+# Case-folded name -> provider id, for matching --providers input
+_PROVIDERS_LC = {pid.lower(): pid for pid in PROVIDERS_CONFIG}
+_PROVIDER_NAMES = tuple(sorted(PROVIDERS_CONFIG))
+_PROVIDERS_HELP = "Check specific providers only: " + ", ".join(_PROVIDER_NAMES)
+
 
 # ─────────────────────────────────────────────
 # Result Data Structure
 # ─────────────────────────────────────────────
 
-def make_result(provider_id: str, label: str) -> dict:
+class Status(IntEnum):
+    """Result status; the value is its position in the report (OK first)."""
+    OK = 0
+    WARNING = 1
+    ERROR = 2
+    UNCONFIGURED = 3
+
+
+def make_result(provider_id: str, label: str, checked_at: Optional[str] = None) -> dict:
     return {
         "provider_id": provider_id,
         "provider": label,
-        "status": "OK",          # OK | WARNING | ERROR | UNCONFIGURED
-        "checked_at": datetime.now(timezone.utc).isoformat(),
+        "status": Status.OK,     # OK | WARNING | ERROR | UNCONFIGURED (by name in JSON)
+        "checked_at": checked_at or datetime.now(timezone.utc).isoformat(),
         "balance": None,
         "limits": {
             "requests_per_minute": None,
@@ -87,6 +142,7 @@ def make_result(provider_id: str, label: str) -> dict:
         "tier": None,
         "warnings": [],
         "error": None,
+        "error_transient": False,  # timeout, transport failure or 5xx — may succeed on retry
         "console_url": None,
         "notes": [],
     }
@@ -94,575 +150,873 @@ def make_result(provider_id: str, label: str) -> dict:
 
 def add_warning(result: dict, msg: str):
     result["warnings"].append(msg)
-    result["status"] = "WARNING"
+    result["status"] = Status.WARNING
 
 
-def set_error(result: dict, msg: str):
+def set_error(result: dict, msg: str, transient: bool = False):
     result["error"] = msg
-    result["status"] = "ERROR"
+    result["error_transient"] = transient
+    result["status"] = Status.ERROR
 
 
-def parse_rate_limit_headers(headers: dict, result: dict, prefix: str = "x-ratelimit"):
-    """Parse common rate limit headers from API responses."""
-    h = {k.lower(): v for k, v in headers.items()}
+def is_transient_error(result: dict) -> bool:
+    """True if result failed in a way a cached result may stand in for (never auth/validation)."""
+    return result["status"] is Status.ERROR and result.get("error_transient", False)
 
-    def get(key):
-        return h.get(f"{prefix}-{key}")
 
-    lim_req = get("limit-requests")
-    lim_tok = get("limit-tokens")
-    rem_req = get("remaining-requests")
-    rem_tok = get("remaining-tokens")
-    reset_req = get("reset-requests")
+def server_error(resp: httpx.Response, result: dict) -> bool:
+    """Record a 5xx from a checker's primary endpoint as a transient ERROR; True if it was one."""
+    if resp.status_code >= 500:
+        set_error(result, f"HTTP {resp.status_code}", transient=True)
+        return True
+    return False
 
-    if lim_req:
-        result["limits"]["requests_per_minute"] = int(lim_req)
-    if lim_tok:
-        result["limits"]["tokens_per_minute"] = int(lim_tok)
-    if rem_req:
-        result["remaining"]["requests"] = int(rem_req)
-    if rem_tok:
-        result["remaining"]["tokens"] = int(rem_tok)
-    if reset_req:
-        result["remaining"]["resets_in_seconds"] = reset_req
 
+def mark_stale(last_good: dict, error: str) -> dict:
+    """Copy of a last good result to serve in place of a failed check, flagged as WARNING."""
+    note = f"stale: served from cache at {last_good['checked_at']} (live check failed: {error})"
+    return {**last_good, "status": Status.WARNING, "cache_stale": True,
+            "notes": [*last_good.get("notes", []), note]}
 
-# ─────────────────────────────────────────────
-# Provider Checkers
-# ─────────────────────────────────────────────
 
-async def check_anthropic(key: str, client: httpx.AsyncClient) -> dict:
-    result = make_result("anthropic", "Anthropic")
-    result["console_url"] = "https://console.anthropic.com"
-    try:
-        resp = await client.get(
-            "https://api.anthropic.com/v1/models",
-            headers={"x-api-key": key, "anthropic-version": "2023-06-01"},
-            timeout=TIMEOUT,
-        )
-        if resp.status_code == 401:
-            set_error(result, "401 Unauthorized — invalid API key")
-            return result
-        if resp.status_code not in (200, 429):
-            set_error(result, f"HTTP {resp.status_code}")
-            return result
-
-        h = {k.lower(): v for k, v in resp.headers.items()}
-
-        def ah(key):
-            return h.get(f"anthropic-ratelimit-{key}")
-
-        rpm = ah("requests-limit")
-        tpm = ah("tokens-limit")
-        rem_req = ah("requests-remaining")
-        rem_tok = ah("tokens-remaining")
-        reset = ah("requests-reset")
-        inp_tpm = ah("input-tokens-limit")
-        out_tpm = ah("output-tokens-limit")
-
-        if rpm:  result["limits"]["requests_per_minute"] = int(rpm)
-        if tpm:  result["limits"]["tokens_per_minute"] = int(tpm)
-        if inp_tpm: result["limits"]["input_tokens_per_minute"] = int(inp_tpm)
-        if out_tpm: result["limits"]["output_tokens_per_minute"] = int(out_tpm)
-        if rem_req: result["remaining"]["requests"] = int(rem_req)
-        if rem_tok: result["remaining"]["tokens"] = int(rem_tok)
-        if reset:   result["remaining"]["resets_in_seconds"] = reset
-
-        result["notes"].append("Billing/balance not available via API — check console.anthropic.com")
-
-        # Determine tier from TPM
-        if tpm:
-            t = int(tpm)
-            if t <= 40000:    result["tier"] = "Tier 1 (Build)"
-            elif t <= 400000: result["tier"] = "Tier 2 (Scale)"
-            elif t <= 2000000: result["tier"] = "Tier 3"
-            else:              result["tier"] = "Tier 4+"
-
-    except httpx.TimeoutException:
-        set_error(result, "Request timed out")
-    except Exception as e:
-        set_error(result, str(e))
-    return result
+def _to_usd(amount: float, currency: str) -> float:
+    """Approximate USD value of a balance (CNY converted at CNY_TO_USD)."""
+    return amount * CNY_TO_USD if currency == "CNY" else amount
 
 
-async def check_openai(key: str, client: httpx.AsyncClient, warn_usd: float) -> dict:
-    result = make_result("openai", "OpenAI")
-    result["console_url"] = "https://platform.openai.com/usage"
-    try:
-        # Subscription info
-        sub_resp = await client.get(
-            "https://api.openai.com/v1/dashboard/billing/subscription",
-            headers={"Authorization": f"Bearer {key}"},
-            timeout=TIMEOUT,
-        )
-        if sub_resp.status_code == 401:
-            set_error(result, "401 Unauthorized — invalid API key")
-            return result
-        if sub_resp.status_code == 403:
-            result["notes"].append("Billing endpoint requires org-level key; rate limits only")
-        elif sub_resp.status_code == 200:
-            sub = sub_resp.json()
-            hard_limit = sub.get("hard_limit_usd") or sub.get("system_hard_limit_usd")
-            plan = sub.get("plan", {}).get("title", "unknown")
-            result["tier"] = plan
-            if hard_limit:
-                result["balance"] = {
-                    "amount": float(hard_limit),
-                    "currency": "USD",
-                    "type": "limit",
-                    "label": "Monthly hard limit"
-                }
-
-        # Usage this month
-        today = datetime.now()
-        start = today.replace(day=1).strftime("%Y-%m-%d")
-        end = today.strftime("%Y-%m-%d")
-        usage_resp = await client.get(
-            f"https://api.openai.com/v1/dashboard/billing/usage?start_date={start}&end_date={end}",
-            headers={"Authorization": f"Bearer {key}"},
-            timeout=TIMEOUT,
-        )
-        if usage_resp.status_code == 200:
-            usage = usage_resp.json()
-            total_cents = usage.get("total_usage", 0)
-            result["usage"] = {
-                "period": f"{today.year}-{today.month:02d}",
-                "cost_usd": round(total_cents / 100, 4),
-            }
+def load_json(resp: httpx.Response):
+    """Decode a response body once, with orjson when it is installed."""
+    return orjson.loads(resp.content) if orjson is not None else resp.json()
 
-        # Rate limits from a lightweight call
-        models_resp = await client.get(
-            "https://api.openai.com/v1/models",
-            headers={"Authorization": f"Bearer {key}"},
-            timeout=TIMEOUT,
-        )
-        if models_resp.status_code == 200:
-            parse_rate_limit_headers(dict(models_resp.headers), result)
 
-    except httpx.TimeoutException:
-        set_error(result, "Request timed out")
-    except Exception as e:
-        set_error(result, str(e))
-    return result
+def provider_safe(fn):
+    """Wrap a checker(result, ...) so any failure lands on result as an ERROR; always returns result."""
+    @wraps(fn)
+    async def wrapper(result: dict, *args, **kwargs) -> dict:
+        try:
+            await fn(result, *args, **kwargs)
+        except httpx.TimeoutException:
+            set_error(result, "Request timed out", transient=True)
+        except httpx.TransportError as e:
+            set_error(result, str(e), transient=True)
+        except Exception as e:
+            set_error(result, str(e))
+        return result
+
+    return wrapper
 
 
-async def check_groq(key: str, client: httpx.AsyncClient) -> dict:
-    result = make_result("groq", "Groq")
-    result["console_url"] = "https://console.groq.com"
+def _int_or_none(val: Optional[str]) -> Optional[int]:
+    """Integer header value; None when the header is absent or not an integer."""
+    if val is None:
+        return None
     try:
-        resp = await client.get(
-            "https://api.groq.com/openai/v1/models",
-            headers={"Authorization": f"Bearer {key}"},
-            timeout=TIMEOUT,
-        )
-        if resp.status_code == 401:
-            set_error(result, "401 Unauthorized — invalid API key")
-            return result
-        if resp.status_code == 200:
-            parse_rate_limit_headers(dict(resp.headers), result)
-            result["notes"].append("Groq is free tier / subscription — no balance API")
-    except httpx.TimeoutException:
-        set_error(result, "Request timed out")
-    except Exception as e:
-        set_error(result, str(e))
-    return result
+        return int(val)
+    except ValueError:
+        return None
+
+
+def _str_or_none(val: Optional[str]) -> Optional[str]:
+    return val or None
+
+
+# (header suffix, result section, result field, converter) for each rate-limit header family
+_XRATELIMIT_FIELDS = (
+    ("limit-requests",      "limits",    "requests_per_minute",      _int_or_none),
+    ("limit-tokens",        "limits",    "tokens_per_minute",        _int_or_none),
+    ("remaining-requests",  "remaining", "requests",                 _int_or_none),
+    ("remaining-tokens",    "remaining", "tokens",                   _int_or_none),
+    ("reset-requests",      "remaining", "resets_in_seconds",        _str_or_none),
+)
+_ANTHROPIC_RATELIMIT_FIELDS = (
+    ("requests-limit",      "limits",    "requests_per_minute",      _int_or_none),
+    ("tokens-limit",        "limits",    "tokens_per_minute",        _int_or_none),
+    ("input-tokens-limit",  "limits",    "input_tokens_per_minute",  _int_or_none),
+    ("output-tokens-limit", "limits",    "output_tokens_per_minute", _int_or_none),
+    ("requests-remaining",  "remaining", "requests",                 _int_or_none),
+    ("tokens-remaining",    "remaining", "tokens",                   _int_or_none),
+    ("requests-reset",      "remaining", "resets_in_seconds",        _str_or_none),
+)
+
+
+# Every known rate-limit header (lowercase) -> (result section, result field, converter)
+_HEADER_MAP: dict[str, tuple[str, str, Callable]] = {
+    f"{prefix}-{suffix}": (section, name, conv)
+    for prefix, fields in (("x-ratelimit", _XRATELIMIT_FIELDS),
+                           ("anthropic-ratelimit", _ANTHROPIC_RATELIMIT_FIELDS))
+    for suffix, section, name, conv in fields
+}
 
 
-async def check_openrouter(key: str, client: httpx.AsyncClient, warn_usd: float) -> dict:
-    result = make_result("openrouter", "OpenRouter")
-    result["console_url"] = "https://openrouter.ai/account"
-    try:
-        resp = await client.get(
-            "https://openrouter.ai/api/v1/auth/key",
-            headers={"Authorization": f"Bearer {key}"},
-            timeout=TIMEOUT,
-        )
-        if resp.status_code == 401:
-            set_error(result, "401 Unauthorized — invalid API key")
-            return result
-        if resp.status_code == 200:
-            data = resp.json().get("data", {})
-            usage = data.get("usage", 0)        # in USD
-            limit = data.get("limit")           # null = unlimited
-            is_free = data.get("is_free_tier", False)
-            rate_limit = data.get("rate_limit", {})
-
-            # Also check /api/v1/credits for total balance
-            credits_resp = await client.get(
-                "https://openrouter.ai/api/v1/credits",
-                headers={"Authorization": f"Bearer {key}"},
-                timeout=TIMEOUT,
-            )
-            total_credits = None
-            if credits_resp.status_code == 200:
-                credits_data = credits_resp.json().get("data", {})
-                total_credits = credits_data.get("total_credits")
-                credits_usage = credits_data.get("total_usage", 0)
-                if total_credits is not None:
-                    usage = credits_usage  # Use credits endpoint usage if available
-
-            # Calculate balance
-            if total_credits is not None:
-                balance_amount = round(float(total_credits) - float(usage), 4)
-            elif limit is not None:
-                balance_amount = round(float(limit) - float(usage), 4)
-            else:
-                balance_amount = None
+def parse_known_headers(headers: httpx.Headers, result: dict):
+    """Copy every recognised rate-limit header into result in one pass over the response headers."""
+    for k, v in headers.items():  # httpx yields lowercased names
+        entry = _HEADER_MAP.get(k)
+        if entry is not None:
+            section, name, conv = entry
+            if (val := conv(v)) is not None:
+                result[section][name] = val
 
+
+# ─────────────────────────────────────────────
+# Provider Checkers
+# ─────────────────────────────────────────────
+
+@dataclass(frozen=True, slots=True)
+class ProviderSpec:
+    """A provider whose check is: one request to validate the key, then read headers."""
+    id: str
+    url: str
+    console: str
+    auth: str = "bearer"            # bearer | token | x-api-key | query
+    method: str = "GET"
+    headers: tuple = ()             # extra (name, value) request headers
+    errors: tuple = ((401, "401 Unauthorized — invalid API key"),)
+    ok_status: tuple = (200,)
+    strict: bool = False            # treat any other status as an "HTTP <code>" error
+    ratelimit: bool = True          # parse known rate-limit headers on success
+    notes: tuple = ()               # always added
+    notes_ok: tuple = ()            # added on success
+    parse: Optional[Callable[[httpx.Response, dict], None]] = None  # extra success-path parsing
+
+
+@provider_safe
+async def check_simple(result: dict, key: str, client: httpx.AsyncClient, spec: ProviderSpec):
+    result["console_url"] = spec.console
+    result["notes"].extend(spec.notes)
+    headers = dict(spec.headers)
+    params = None
+    if spec.auth == "bearer":
+        headers["Authorization"] = f"Bearer {key}"
+    elif spec.auth == "token":
+        headers["Authorization"] = f"Token {key}"
+    elif spec.auth == "x-api-key":
+        headers["x-api-key"] = key
+    elif spec.auth == "query":
+        params = {"key": key}
+
+    resp = await client.request(spec.method, spec.url, headers=headers, params=params)
+    for status, msg in spec.errors:
+        if resp.status_code == status:
+            set_error(result, msg)
+            return
+    if server_error(resp, result):
+        return
+    if resp.status_code not in spec.ok_status:
+        if spec.strict:
+            set_error(result, f"HTTP {resp.status_code}")
+        return
+
+    if spec.parse:
+        spec.parse(resp, result)
+        if result["error"]:
+            return
+    if spec.ratelimit:
+        parse_known_headers(resp.headers, result)
+    result["notes"].extend(spec.notes_ok)
+
+
+def _parse_anthropic(resp: httpx.Response, result: dict):
+    parse_known_headers(resp.headers, result)
+
+    # Determine tier from TPM
+    t = result["limits"]["tokens_per_minute"]
+    if t is not None:
+        if t <= 40000:    result["tier"] = "Tier 1 (Build)"
+        elif t <= 400000: result["tier"] = "Tier 2 (Scale)"
+        elif t <= 2000000: result["tier"] = "Tier 3"
+        else:              result["tier"] = "Tier 4+"
+
+
+def _parse_cohere(resp: httpx.Response, result: dict):
+    if not load_json(resp).get("valid", False):
+        set_error(result, "API key reported as invalid by Cohere")
+
+
+def _parse_account_type(resp: httpx.Response, result: dict, default: str = "unknown"):
+    result["tier"] = load_json(resp).get("type", default)
+
+
+SIMPLE_PROVIDERS = (
+    ProviderSpec(
+        "anthropic", "https://api.anthropic.com/v1/models",
+        console="https://console.anthropic.com",
+        auth="x-api-key", headers=(("anthropic-version", "2023-06-01"),),
+        ok_status=(200, 429), strict=True, ratelimit=False, parse=_parse_anthropic,
+        notes_ok=("Billing/balance not available via API — check console.anthropic.com",),
+    ),
+    ProviderSpec(
+        "groq", "https://api.groq.com/openai/v1/models",
+        console="https://console.groq.com",
+        notes_ok=("Groq is free tier / subscription — no balance API",),
+    ),
+    ProviderSpec(
+        "mistral", "https://api.mistral.ai/v1/models",
+        console="https://console.mistral.ai",
+        notes_ok=("Billing details available at console.mistral.ai",),
+    ),
+    ProviderSpec(
+        "gemini", "https://generativelanguage.googleapis.com/v1beta/models",
+        console="https://console.cloud.google.com/apis/api/generativelanguage.googleapis.com/quotas",
+        auth="query",
+        errors=((400, "400 Bad Request — invalid API key format"),
+                (403, "403 Forbidden — key may be restricted or billing not enabled")),
+        notes_ok=("Detailed quota limits available in Google Cloud Console",),
+    ),
+    ProviderSpec(
+        "cohere", "https://api.cohere.com/v1/check-api-key",
+        console="https://dashboard.cohere.com",
+        method="POST", headers=(("Content-Type", "application/json"),), parse=_parse_cohere,
+        notes_ok=("Billing details at dashboard.cohere.com",),
+    ),
+    ProviderSpec(
+        "replicate", "https://api.replicate.com/v1/account",
+        console="https://replicate.com/account/billing",
+        auth="token", errors=((401, "401 Unauthorized — invalid API token"),),
+        ratelimit=False, parse=_parse_account_type,
+        notes_ok=("Billing details at replicate.com/account/billing",),
+    ),
+    ProviderSpec(
+        "perplexity", "https://api.perplexity.ai/models",
+        console="https://www.perplexity.ai/settings/api",
+        ok_status=(200, 404),  # 404 = endpoint DNE but key valid
+        notes=("No public balance API — check perplexity.ai/settings/api",),
+    ),
+    ProviderSpec(
+        "huggingface", "https://huggingface.co/api/whoami",
+        console="https://huggingface.co/settings/billing",
+        errors=((401, "401 Unauthorized — invalid token"),),
+        ratelimit=False, parse=partial(_parse_account_type, default="user"),
+        notes_ok=("Billing at huggingface.co/settings/billing",),
+    ),
+)
+
+
+@provider_safe
+async def check_openai(result: dict, key: str, client: httpx.AsyncClient, warn_usd: float,
+                       month_range: tuple[str, str]):
+    result["console_url"] = "https://platform.openai.com/usage"
+    headers = {"Authorization": f"Bearer {key}"}
+    start, end = month_range
+
+    # Subscription, usage this month, and rate limits (from a lightweight call) are
+    # independent — fetch them concurrently instead of three serial round trips
+    sub_resp, usage_resp, models_resp = await asyncio.gather(
+        client.get("https://api.openai.com/v1/dashboard/billing/subscription", headers=headers),
+        client.get(
+            f"https://api.openai.com/v1/dashboard/billing/usage?start_date={start}&end_date={end}",
+            headers=headers,
+        ),
+        client.get("https://api.openai.com/v1/models", headers=headers),
+        return_exceptions=True,
+    )
+    if isinstance(sub_resp, BaseException):
+        raise sub_resp
+    if sub_resp.status_code == 401:
+        set_error(result, "401 Unauthorized — invalid API key")
+        return
+    if server_error(sub_resp, result):
+        return
+    for resp in (usage_resp, models_resp):
+        if isinstance(resp, BaseException):
+            raise resp
+
+    if sub_resp.status_code == 403:
+        result["notes"].append("Billing endpoint requires org-level key; rate limits only")
+    elif sub_resp.status_code == 200:
+        sub = load_json(sub_resp)
+        hard_limit = sub.get("hard_limit_usd") or sub.get("system_hard_limit_usd")
+        plan = sub.get("plan", {}).get("title", "unknown")
+        result["tier"] = plan
+        if hard_limit:
             result["balance"] = {
-                "amount": balance_amount,
+                "amount": float(hard_limit),
                 "currency": "USD",
-                "type": "free_tier" if is_free else "prepaid",
-                "total_credits": total_credits,
-                "total_limit": limit,
-                "used": usage,
+                "type": "limit",
+                "label": "Monthly hard limit"
             }
 
-            if rate_limit:
-                requests = rate_limit.get("requests")
-                interval = rate_limit.get("interval", "")
-                if requests:
-                    result["limits"]["requests_per_minute"] = requests
-                    result["notes"].append(f"Rate limit: {requests} req / {interval}")
+    if usage_resp.status_code == 200:
+        usage = load_json(usage_resp)
+        total_cents = usage.get("total_usage", 0)
+        result["usage"] = {
+            "period": start[:7],
+            "cost_usd": round(total_cents / 100, 4),
+        }
 
-            if result["balance"]["amount"] is not None and result["balance"]["amount"] < warn_usd:
-                add_warning(result, f"Balance ${result['balance']['amount']:.2f} below threshold ${warn_usd:.2f}")
+    if models_resp.status_code == 200:
+        parse_known_headers(models_resp.headers, result)
 
-            result["tier"] = "Free tier" if is_free else "Paid"
 
-    except httpx.TimeoutException:
-        set_error(result, "Request timed out")
-    except Exception as e:
-        set_error(result, str(e))
-    return result
+@provider_safe
+async def check_openrouter(result: dict, key: str, client: httpx.AsyncClient, warn_usd: float):
+    result["console_url"] = "https://openrouter.ai/account"
+    headers = {"Authorization": f"Bearer {key}"}
+    # Key info and /api/v1/credits (total balance) are independent — fetch concurrently
+    resp, credits_resp = await asyncio.gather(
+        client.get("https://openrouter.ai/api/v1/auth/key", headers=headers),
+        client.get("https://openrouter.ai/api/v1/credits", headers=headers),
+        return_exceptions=True,
+    )
+    if isinstance(resp, BaseException):
+        raise resp
+    if resp.status_code == 401:
+        set_error(result, "401 Unauthorized — invalid API key")
+        return
+    if server_error(resp, result):
+        return
+    if resp.status_code == 200:
+        if isinstance(credits_resp, BaseException):
+            raise credits_resp
+        data = load_json(resp).get("data", {})
+        usage = data.get("usage", 0)        # in USD
+        limit = data.get("limit")           # null = unlimited
+        is_free = data.get("is_free_tier", False)
+        rate_limit = data.get("rate_limit", {})
+
+        total_credits = None
+        if credits_resp.status_code == 200:
+            credits_data = load_json(credits_resp).get("data", {})
+            total_credits = credits_data.get("total_credits")
+            credits_usage = credits_data.get("total_usage", 0)
+            if total_credits is not None:
+                usage = credits_usage  # Use credits endpoint usage if available
+
+        # Calculate balance
+        if total_credits is not None:
+            balance_amount = round(float(total_credits) - float(usage), 4)
+        elif limit is not None:
+            balance_amount = round(float(limit) - float(usage), 4)
+        else:
+            balance_amount = None
+
+        result["balance"] = {
+            "amount": balance_amount,
+            "currency": "USD",
+            "type": "free_tier" if is_free else "prepaid",
+            "total_credits": total_credits,
+            "total_limit": limit,
+            "used": usage,
+        }
+
+        if rate_limit:
+            requests = rate_limit.get("requests")
+            interval = rate_limit.get("interval", "")
+            if requests is not None:
+                result["limits"]["requests_per_minute"] = requests
+                result["notes"].append(f"Rate limit: {requests} req / {interval}")
 
+        if result["balance"]["amount"] is not None and result["balance"]["amount"] < warn_usd:
+            add_warning(result, f"Balance ${result['balance']['amount']:.2f} below threshold ${warn_usd:.2f}")
 
-async def check_deepseek(key: str, client: httpx.AsyncClient, warn_usd: float) -> dict:
-    result = make_result("deepseek", "Deepseek")
+        result["tier"] = "Free tier" if is_free else "Paid"
+
+
+@provider_safe
+async def check_deepseek(result: dict, key: str, client: httpx.AsyncClient, warn_usd: float):
     result["console_url"] = "https://platform.deepseek.com"
-    try:
-        resp = await client.get(
-            "https://api.deepseek.com/user/balance",
-            headers={"Authorization": f"Bearer {key}"},
-            timeout=TIMEOUT,
-        )
-        if resp.status_code == 401:
-            set_error(result, "401 Unauthorized — invalid API key")
-            return result
-        if resp.status_code == 200:
-            data = resp.json()
-            is_available = data.get("is_available", True)
-            balances = data.get("balance_infos", [])
-            for b in balances:
-                currency = b.get("currency", "CNY")
-                total = float(b.get("total_balance", 0))
-                usd_equiv = total * CNY_TO_USD if currency == "CNY" else total
-                result["balance"] = {
-                    "amount": total,
-                    "currency": currency,
-                    "usd_equivalent": round(usd_equiv, 2),
-                    "type": "prepaid",
-                }
-                if usd_equiv < warn_usd:
-                    add_warning(result, f"Balance {currency} {total:.2f} (~${usd_equiv:.2f} USD) below threshold")
-            if not is_available:
-                add_warning(result, "Account marked as unavailable")
-    except httpx.TimeoutException:
-        set_error(result, "Request timed out")
-    except Exception as e:
-        set_error(result, str(e))
-    return result
+    resp = await client.get(
+        "https://api.deepseek.com/user/balance",
+        headers={"Authorization": f"Bearer {key}"},
+    )
+    if resp.status_code == 401:
+        set_error(result, "401 Unauthorized — invalid API key")
+        return
+    if server_error(resp, result):
+        return
+    if resp.status_code == 200:
+        data = load_json(resp)
+        is_available = data.get("is_available", True)
+        balances = data.get("balance_infos", [])
+        for b in balances:
+            currency = b.get("currency", "CNY")
+            total = float(b.get("total_balance", 0))
+            usd_equiv = _to_usd(total, currency)
+            result["balance"] = {
+                "amount": total,
+                "currency": currency,
+                "type": "prepaid",
+            }
+            if usd_equiv < warn_usd:
+                add_warning(result, f"Balance {currency} {total:.2f} (~${usd_equiv:.2f} USD) below threshold")
+        if not is_available:
+            add_warning(result, "Account marked as unavailable")
 
 
-async def check_together(key: str, client: httpx.AsyncClient, warn_usd: float) -> dict:
-    result = make_result("together", "Together AI")
+@provider_safe
+async def check_together(result: dict, key: str, client: httpx.AsyncClient, warn_usd: float):
     result["console_url"] = "https://api.together.xyz/settings/billing"
-    try:
-        resp = await client.get(
-            "https://api.together.xyz/v1/organizations/me",
+    resp = await client.get(
+        "https://api.together.xyz/v1/organizations/me",
+        headers={"Authorization": f"Bearer {key}"},
+    )
+    if resp.status_code == 401:
+        set_error(result, "401 Unauthorized — invalid API key")
+        return
+    if server_error(resp, result):
+        return
+    if resp.status_code == 200:
+        data = load_json(resp)
+        credits = data.get("credits")
+        if credits is not None:
+            result["balance"] = {
+                "amount": float(credits),
+                "currency": "USD",
+                "type": "prepaid",
+            }
+            if float(credits) < warn_usd:
+                add_warning(result, f"Credit balance ${float(credits):.2f} below threshold")
+    elif resp.status_code == 404:
+        # Try alternate endpoint
+        resp2 = await client.get(
+            "https://api.together.xyz/v1/users/me",
             headers={"Authorization": f"Bearer {key}"},
-            timeout=TIMEOUT,
         )
-        if resp.status_code == 401:
-            set_error(result, "401 Unauthorized — invalid API key")
-            return result
-        if resp.status_code == 200:
-            data = resp.json()
-            credits = data.get("credits")
-            if credits is not None:
-                result["balance"] = {
-                    "amount": float(credits),
-                    "currency": "USD",
-                    "type": "prepaid",
-                }
-                if float(credits) < warn_usd:
-                    add_warning(result, f"Credit balance ${float(credits):.2f} below threshold")
-        elif resp.status_code == 404:
-            # Try alternate endpoint
-            resp2 = await client.get(
-                "https://api.together.xyz/v1/users/me",
-                headers={"Authorization": f"Bearer {key}"},
-                timeout=TIMEOUT,
-            )
-            if resp2.status_code == 200:
-                result["notes"].append("Account active (billing details at console)")
-    except httpx.TimeoutException:
-        set_error(result, "Request timed out")
-    except Exception as e:
-        set_error(result, str(e))
-    return result
+        if resp2.status_code == 200:
+            result["notes"].append("Account active (billing details at console)")
 
 
-async def check_mistral(key: str, client: httpx.AsyncClient) -> dict:
-    result = make_result("mistral", "Mistral AI")
-    result["console_url"] = "https://console.mistral.ai"
-    try:
+@provider_safe
+async def check_moonshot(result: dict, key: str, client: httpx.AsyncClient, warn_usd: float):
+    result["console_url"] = "https://platform.moonshot.cn"
+    # Try international endpoint first, fall back to China
+    resp = await client.get(
+        "https://api.moonshot.ai/v1/users/me/balance",
+        headers={"Authorization": f"Bearer {key}"},
+    )
+    if resp.status_code == 401:
+        # Try China endpoint
         resp = await client.get(
-            "https://api.mistral.ai/v1/models",
+            "https://api.moonshot.cn/v1/users/me/balance",
             headers={"Authorization": f"Bearer {key}"},
-            timeout=TIMEOUT,
         )
-        if resp.status_code == 401:
-            set_error(result, "401 Unauthorized — invalid API key")
-            return result
-        if resp.status_code == 200:
-            parse_rate_limit_headers(dict(resp.headers), result)
-            result["notes"].append("Billing details available at console.mistral.ai")
-    except httpx.TimeoutException:
-        set_error(result, "Request timed out")
-    except Exception as e:
-        set_error(result, str(e))
-    return result
+    if resp.status_code == 401:
+        set_error(result, "401 Unauthorized — invalid API key")
+        return
+    if server_error(resp, result):
+        return
+    if resp.status_code == 200:
+        data = load_json(resp)
+        balance = data.get("data", {})
+        # Handle both international and China API response formats
+        available = float(balance.get("available_balance", 0))
+        currency = balance.get("currency")
+        # International API (api.moonshot.ai) returns USD, China API returns CNY
+        is_international = "moonshot.ai" in str(resp.url)
+        if currency is None:
+            currency = "USD" if is_international else "CNY"
+        usd_equiv = _to_usd(available, currency)
+        result["balance"] = {
+            "amount": available,
+            "currency": currency,
+            "type": "prepaid",
+        }
+        if usd_equiv < warn_usd:
+            add_warning(result, f"Balance {currency} {available:.2f} (~${usd_equiv:.2f} USD) below threshold")
+
+
+# provider_id -> (checker, names of the per-run arguments it takes after (result, key, client))
+_CHECKERS: dict[str, tuple[Callable, tuple[str, ...]]] = {
+    "openai":      (check_openai, ("warn_usd", "month_range")),
+    "openrouter":  (check_openrouter, ("warn_usd",)),
+    "deepseek":    (check_deepseek, ("warn_usd",)),
+    "together":    (check_together, ("warn_usd",)),
+    "moonshot":    (check_moonshot, ("warn_usd",)),
+    **{spec.id: (partial(check_simple, spec=spec), ()) for spec in SIMPLE_PROVIDERS},
+}
 
+# Fold each checker into its PROVIDERS_CONFIG record so run_checks does a single lookup
+for _pid, (_checker, _args) in _CHECKERS.items():
+    PROVIDERS_CONFIG[_pid].update(checker=_checker, args=_args)
 
-async def check_gemini(key: str, client: httpx.AsyncClient) -> dict:
-    result = make_result("gemini", "Google Gemini")
-    result["console_url"] = "https://console.cloud.google.com/apis/api/generativelanguage.googleapis.com/quotas"
-    try:
-        resp = await client.get(
-            f"https://generativelanguage.googleapis.com/v1beta/models?key={key}",
-            timeout=TIMEOUT,
-        )
-        if resp.status_code == 400:
-            set_error(result, "400 Bad Request — invalid API key format")
-            return result
-        if resp.status_code == 403:
-            set_error(result, "403 Forbidden — key may be restricted or billing not enabled")
-            return result
-        if resp.status_code == 200:
-            parse_rate_limit_headers(dict(resp.headers), result)
-            result["notes"].append("Detailed quota limits available in Google Cloud Console")
-    except httpx.TimeoutException:
-        set_error(result, "Request timed out")
-    except Exception as e:
-        set_error(result, str(e))
-    return result
 
+# ─────────────────────────────────────────────
+# Main Runner
+# ─────────────────────────────────────────────
 
-async def check_cohere(key: str, client: httpx.AsyncClient) -> dict:
-    result = make_result("cohere", "Cohere")
-    result["console_url"] = "https://dashboard.cohere.com"
-    try:
-        resp = await client.post(
-            "https://api.cohere.com/v1/check-api-key",
-            headers={"Authorization": f"Bearer {key}", "Content-Type": "application/json"},
-            timeout=TIMEOUT,
-        )
-        if resp.status_code == 401:
-            set_error(result, "401 Unauthorized — invalid API key")
-            return result
-        if resp.status_code == 200:
-            data = resp.json()
-            valid = data.get("valid", False)
-            if not valid:
-                set_error(result, "API key reported as invalid by Cohere")
-            else:
-                parse_rate_limit_headers(dict(resp.headers), result)
-                result["notes"].append("Billing details at dashboard.cohere.com")
-    except httpx.TimeoutException:
-        set_error(result, "Request timed out")
-    except Exception as e:
-        set_error(result, str(e))
-    return result
+class _HostLimitedClient(httpx.AsyncClient):
+    """AsyncClient that keeps at most max_per_host requests to one host in flight at once.
 
+    The limit is applied in send() rather than by swapping the transport, so httpx still
+    builds its own transports (and honours HTTP(S)_PROXY / NO_PROXY) from the usual arguments.
+    """
 
-async def check_replicate(key: str, client: httpx.AsyncClient, warn_usd: float) -> dict:
-    result = make_result("replicate", "Replicate")
-    result["console_url"] = "https://replicate.com/account/billing"
-    try:
-        resp = await client.get(
-            "https://api.replicate.com/v1/account",
-            headers={"Authorization": f"Token {key}"},
-            timeout=TIMEOUT,
-        )
-        if resp.status_code == 401:
-            set_error(result, "401 Unauthorized — invalid API token")
-            return result
-        if resp.status_code == 200:
-            data = resp.json()
-            result["tier"] = data.get("type", "unknown")
-            result["notes"].append("Billing details at replicate.com/account/billing")
-    except httpx.TimeoutException:
-        set_error(result, "Request timed out")
-    except Exception as e:
-        set_error(result, str(e))
-    return result
+    def __init__(self, *, max_per_host: int, **kwargs):
+        super().__init__(**kwargs)
+        self._max_per_host = max_per_host
+        self._host_sems: dict[str, asyncio.Semaphore] = {}
 
+    async def send(self, request: httpx.Request, **kwargs) -> httpx.Response:
+        host = request.url.host
+        sem = self._host_sems.get(host)
+        if sem is None:
+            sem = self._host_sems[host] = asyncio.Semaphore(self._max_per_host)
+        async with sem:
+            return await super().send(request, **kwargs)
 
-async def check_perplexity(key: str, client: httpx.AsyncClient) -> dict:
-    result = make_result("perplexity", "Perplexity")
-    result["console_url"] = "https://www.perplexity.ai/settings/api"
-    result["notes"].append("No public balance API — check perplexity.ai/settings/api")
-    # Validate key with a minimal models call
+
+# event loop -> ({(max_per_host, timeout): client}, guard): clients are bound to the loop they were
+# made on, and each loop's guard closes all of them when that loop shuts down
+_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, tuple[dict, object]]" = \
+    weakref.WeakKeyDictionary()
+
+
+async def _close_with_loop(clients: dict):
+    """Parked at its yield until the loop finalizes it at shutdown (asyncio.run() calls
+    shutdown_asyncgens()), then closes the loop's clients and drops its _CLIENTS entry."""
     try:
-        resp = await client.get(
-            "https://api.perplexity.ai/models",
-            headers={"Authorization": f"Bearer {key}"},
-            timeout=TIMEOUT,
-        )
-        if resp.status_code == 401:
-            set_error(result, "401 Unauthorized — invalid API key")
-        elif resp.status_code in (200, 404):  # 404 = endpoint DNE but key valid
-            parse_rate_limit_headers(dict(resp.headers), result)
-    except httpx.TimeoutException:
-        set_error(result, "Request timed out")
-    except Exception as e:
-        set_error(result, str(e))
-    return result
+        yield
+    finally:
+        for client in list(clients.values()):
+            await client.aclose()
+        clients.clear()
+        _CLIENTS.pop(asyncio.get_running_loop(), None)
 
 
-async def check_moonshot(key: str, client: httpx.AsyncClient, warn_usd: float) -> dict:
-    result = make_result("moonshot", "Moonshot/Kimi")
-    result["console_url"] = "https://platform.moonshot.cn"
+async def _start_guard(guard):
+    """Advance guard to its yield; nothing to do if close_client() already closed it."""
     try:
-        # Try international endpoint first, fall back to China
-        resp = await client.get(
-            "https://api.moonshot.ai/v1/users/me/balance",
-            headers={"Authorization": f"Bearer {key}"},
-            timeout=TIMEOUT,
+        await guard.__anext__()
+    except StopAsyncIteration:
+        pass
+
+
+def get_client(max_per_host: int = MAX_PER_HOST, timeout: float = TIMEOUT) -> httpx.AsyncClient:
+    """Return the shared AsyncClient, built lazily and reused across run_checks() calls.
+
+    There is one client per event loop, per-host limit and request timeout, so a call with
+    different settings never disturbs requests in flight on another client. Clients are
+    closed when their loop shuts down; close_client() closes them sooner.
+    """
+    loop = asyncio.get_running_loop()
+    entry = _CLIENTS.get(loop)
+    if entry is None:
+        clients = {}
+        guard = _close_with_loop(clients)
+        loop.create_task(_start_guard(guard))
+        entry = _CLIENTS[loop] = (clients, guard)
+    clients = entry[0]
+    client = clients.get((max_per_host, timeout))
+    if client is None or client.is_closed:
+        client = clients[max_per_host, timeout] = _HostLimitedClient(
+            max_per_host=max_per_host,
+            http2=HTTP2,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=MAX_CONNECTIONS,
+                                max_keepalive_connections=MAX_KEEPALIVE),
+            timeout=httpx.Timeout(timeout, connect=min(CONNECT_TIMEOUT, timeout)),
         )
-        if resp.status_code == 401:
-            # Try China endpoint
-            resp = await client.get(
-                "https://api.moonshot.cn/v1/users/me/balance",
-                headers={"Authorization": f"Bearer {key}"},
-                timeout=TIMEOUT,
-            )
-        if resp.status_code == 401:
-            set_error(result, "401 Unauthorized — invalid API key")
-            return result
-        if resp.status_code == 200:
-            data = resp.json()
-            balance = data.get("data", {})
-            # Handle both international and China API response formats
-            available = float(balance.get("available_balance", 0))
-            currency = balance.get("currency")
-            # International API (api.moonshot.ai) returns USD, China API returns CNY
-            is_international = "moonshot.ai" in str(resp.url)
-            if currency is None:
-                currency = "USD" if is_international else "CNY"
-            usd_equiv = available if currency == "USD" else available * CNY_TO_USD
-            result["balance"] = {
-                "amount": available,
-                "currency": currency,
-                "usd_equivalent": round(usd_equiv, 2),
-                "type": "prepaid",
-            }
-            if usd_equiv < warn_usd:
-                add_warning(result, f"Balance {currency} {available:.2f} (~${usd_equiv:.2f} USD) below threshold")
-    except httpx.TimeoutException:
-        set_error(result, "Request timed out")
-    except Exception as e:
-        set_error(result, str(e))
-    return result
+    return client
+
+
+async def close_client():
+    """Close the shared AsyncClients made on the running event loop, if any."""
+    entry = _CLIENTS.pop(asyncio.get_running_loop(), None)
+    if entry is not None:
+        clients, guard = entry
+        for client in clients.values():
+            await client.aclose()
+        clients.clear()
+        await guard.aclose()
 
 
-async def check_huggingface(key: str, client: httpx.AsyncClient) -> dict:
-    result = make_result("huggingface", "Hugging Face")
-    result["console_url"] = "https://huggingface.co/settings/billing"
+@lru_cache(maxsize=2)
+def _month_range(today_ordinal: int) -> tuple[str, str]:
+    """(first of month, today) as YYYY-MM-DD for a date ordinal; cached so polls don't re-format."""
+    today = date.fromordinal(today_ordinal)
+    return today.replace(day=1).strftime("%Y-%m-%d"), today.strftime("%Y-%m-%d")
+
+
+async def _settle(coro, timeout: Optional[float] = None):
+    """Await coro within timeout, returning (not raising) any exception it ends with."""
     try:
-        resp = await client.get(
-            "https://huggingface.co/api/whoami",
-            headers={"Authorization": f"Bearer {key}"},
-            timeout=TIMEOUT,
-        )
-        if resp.status_code == 401:
-            set_error(result, "401 Unauthorized — invalid token")
-            return result
-        if resp.status_code == 200:
-            data = resp.json()
-            result["tier"] = data.get("type", "user")
-            result["notes"].append("Billing at huggingface.co/settings/billing")
-    except httpx.TimeoutException:
-        set_error(result, "Request timed out")
+        if sys.version_info >= (3, 11):
+            async with asyncio.timeout(timeout):
+                return await coro
+        return await asyncio.wait_for(coro, timeout)
+    except (asyncio.TimeoutError, TimeoutError):
+        return asyncio.TimeoutError("Request timed out")
     except Exception as e:
-        set_error(result, str(e))
-    return result
+        return e
+
+
+async def _run_bounded(coros: dict, timeout: float, deadline: float) -> dict:
+    """Run {pid: coro} concurrently, each within timeout and all within deadline.
+
+    Returns {pid: result | exception}; checks cut off by either limit are reported as timeouts.
+    """
+    if sys.version_info >= (3, 11):
+        tasks = {}
+        try:
+            async with asyncio.timeout(deadline):
+                async with asyncio.TaskGroup() as tg:
+                    tasks = {pid: tg.create_task(_settle(coro, timeout)) for pid, coro in coros.items()}
+        except TimeoutError:
+            pass
+    else:
+        tasks = {pid: asyncio.ensure_future(_settle(coro, timeout)) for pid, coro in coros.items()}
+        _, pending = await asyncio.wait(tasks.values(), timeout=deadline)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    return {
+        pid: asyncio.TimeoutError("Request timed out") if task.cancelled() else task.result()
+        for pid, task in tasks.items()
+    }
 
 
-# ─────────────────────────────────────────────
-# Main Runner
-# ─────────────────────────────────────────────
+async def run_checks(providers_filter: list, warn_usd: float, timeout: float = PROVIDER_TIMEOUT,
+                     client: Optional[httpx.AsyncClient] = None,
+                     max_per_host: int = MAX_PER_HOST) -> list:
+    """Check every configured provider (or those in providers_filter) concurrently.
 
-async def run_checks(providers_filter: list, warn_usd: float) -> list:
+    All checks share one pooled client: the caller's, if given, else the module's shared
+    one, which allows at most max_per_host concurrent requests to any one host.
+    """
     results = []
-    tasks = {}
-
-    async with httpx.AsyncClient(follow_redirects=True) as client:
-        checker_map = {
-            "anthropic":   lambda k: check_anthropic(k, client),
-            "openai":      lambda k: check_openai(k, client, warn_usd),
-            "groq":        lambda k: check_groq(k, client),
-            "openrouter":  lambda k: check_openrouter(k, client, warn_usd),
-            "deepseek":    lambda k: check_deepseek(k, client, warn_usd),
-            "together":    lambda k: check_together(k, client, warn_usd),
-            "mistral":     lambda k: check_mistral(k, client),
-            "gemini":      lambda k: check_gemini(k, client),
-            "cohere":      lambda k: check_cohere(k, client),
-            "replicate":   lambda k: check_replicate(k, client, warn_usd),
-            "perplexity":  lambda k: check_perplexity(k, client),
-            "moonshot":    lambda k: check_moonshot(k, client, warn_usd),
-            "huggingface": lambda k: check_huggingface(k, client),
-        }
+    checked_at = datetime.now(timezone.utc).isoformat()
 
-        # Collect configured providers
-        for pid, cfg in PROVIDERS_CONFIG.items():
-            if providers_filter and pid not in providers_filter:
-                continue
-            key = os.environ.get(cfg["env"], "").strip()
-            if not key:
-                r = make_result(pid, cfg["label"])
-                r["status"] = "UNCONFIGURED"
-                r["notes"].append(f"Set {cfg['env']} to enable this provider")
-                results.append(r)
-                continue
-            if pid in checker_map:
-                tasks[pid] = asyncio.create_task(checker_map[pid](key))
-
-        # Run all checks concurrently
-        if tasks:
-            done = await asyncio.gather(*tasks.values(), return_exceptions=True)
-            for pid, result in zip(tasks.keys(), done):
-                if isinstance(result, Exception):
-                    r = make_result(pid, PROVIDERS_CONFIG[pid]["label"])
-                    set_error(r, str(result))
-                    results.append(r)
-                else:
-                    results.append(result)
+    # Partition into configured / unconfigured before any network setup
+    configured = []
+    for pid, cfg in PROVIDERS_CONFIG.items():
+        if providers_filter and pid not in providers_filter:
+            continue
+        key = os.environ.get(cfg["env"], "").strip()
+        if key:
+            configured.append((pid, cfg, key))
+            continue
+        r = make_result(pid, cfg["label"], checked_at)
+        r["status"] = Status.UNCONFIGURED
+        r["notes"].append(f"Set {cfg['env']} to enable this provider")
+        results.append(r)
+
+    # Run all checks concurrently — the client is only built if there is something to check
+    if configured:
+        # A single request may use the provider's whole budget
+        client = client or get_client(max_per_host, timeout)
+        run_args = {"warn_usd": warn_usd, "month_range": _month_range(date.today().toordinal())}
+        checked = {}
+        coros = {}
+        for pid, cfg, key in configured:
+            checker = cfg.get("checker")
+            if checker is not None:
+                r = checked[pid] = make_result(pid, cfg["label"], checked_at)
+                coros[pid] = checker(r, key, client, *(run_args[a] for a in cfg["args"]))
+
+        done = await _run_bounded(coros, timeout, timeout * BATCH_TIMEOUT_FACTOR)
+        for pid, outcome in done.items():
+            r = checked[pid]
+            if isinstance(outcome, Exception):
+                set_error(r, str(outcome),
+                          transient=isinstance(outcome, (asyncio.TimeoutError, httpx.TransportError)))
+            results.append(r)
+
+    sort_results(results)
+    return results
 
+
+def sort_results(results: list):
     # Sort: OK first, then WARNING, ERROR, UNCONFIGURED
-    order = {"OK": 0, "WARNING": 1, "ERROR": 2, "UNCONFIGURED": 3}
-    results.sort(key=lambda r: order.get(r["status"], 9))
+    if len(results) > 1:
+        results.sort(key=itemgetter("status"))
+
+
+def _public(result: dict) -> dict:
+    """Output form of a result: status by name, USD equivalent filled in."""
+    out = {**result, "status": result["status"].name}
+    b = out.get("balance")
+    if b and b.get("amount") is not None:
+        out["balance"] = {**b, "usd_equivalent": round(_to_usd(b["amount"], b.get("currency", "USD")), 2)}
+    return out
+
+
+def results_to_json_bytes(results: list, indent: bool = True, newline: bool = False) -> bytes:
+    """UTF-8 JSON for writing straight to a file or stdout; uses orjson when installed."""
+    data = [_public(r) for r in results]
+    if orjson is not None:
+        option = (orjson.OPT_INDENT_2 if indent else 0) | (orjson.OPT_APPEND_NEWLINE if newline else 0)
+        return orjson.dumps(data, option=option)
+    # Match orjson's output byte for byte: compact form has no spaces after separators
+    out = json.dumps(data, indent=2 if indent else None, ensure_ascii=False,
+                     separators=None if indent else (",", ":")).encode()
+    return out + b"\n" if newline else out
+
+
+# (provider_id, warn_usd) -> (expires_at, result). Entries outlive their TTL so the
+# last good result can still be served if a refresh fails.
+_CACHE: dict[tuple[str, float], tuple[float, dict]] = {}
+_CACHE_LOCKS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+
+
+def _cache_lock() -> asyncio.Lock:
+    loop = asyncio.get_running_loop()
+    lock = _CACHE_LOCKS.get(loop)
+    if lock is None:
+        lock = _CACHE_LOCKS[loop] = asyncio.Lock()
+    return lock
+
+
+async def run_checks_cached(providers_filter: list, warn_usd: float, ttl: float = CACHE_TTL,
+                            ttl_overrides: Optional[dict] = None,
+                            timeout: float = PROVIDER_TIMEOUT,
+                            client: Optional[httpx.AsyncClient] = None) -> list:
+    """run_checks() behind an in-process, per-provider TTL cache for callers that poll.
+
+    ttl_overrides sets a per-provider TTL, e.g. {"openai": 300}. When a refresh fails
+    transiently (timeout, network error or 5xx; see is_transient_error()), the last good
+    result is returned instead via mark_stale(); other errors are returned as they are.
+    Returned results are copies and safe to modify.
+    """
+    ttl_overrides = ttl_overrides or {}
+    wanted = [pid for pid in PROVIDERS_CONFIG if not providers_filter or pid in providers_filter]
+
+    # Held across the refresh so concurrent pollers wait for it instead of all fetching
+    async with _cache_lock():
+        now = time.monotonic()
+        by_pid, missing = {}, []
+        for pid in wanted:
+            entry = _CACHE.get((pid, warn_usd))
+            if entry is not None and now < entry[0]:
+                by_pid[pid] = entry[1]
+            else:
+                missing.append(pid)
+
+        if missing:
+            try:
+                fresh = await run_checks(missing, warn_usd, timeout, client)
+            except Exception as e:
+                fresh = []
+                for pid in missing:
+                    r = make_result(pid, PROVIDERS_CONFIG[pid]["label"])
+                    set_error(r, str(e),
+                              transient=isinstance(e, (asyncio.TimeoutError, httpx.TransportError)))
+                    fresh.append(r)
+
+            now = time.monotonic()
+            for r in fresh:
+                pid = r["provider_id"]
+                if r["status"] is Status.ERROR:
+                    entry = _CACHE.get((pid, warn_usd))
+                    if entry is not None and is_transient_error(r):
+                        r = mark_stale(entry[1], r["error"])
+                elif r["status"] is not Status.UNCONFIGURED:
+                    _CACHE[(pid, warn_usd)] = (now + ttl_overrides.get(pid, ttl), r)
+                by_pid[pid] = r
+
+    # Copies, so callers can't mutate what is cached
+    results = [copy.deepcopy(by_pid[pid]) for pid in wanted]
+    sort_results(results)
     return results
 
 
+def _asyncio_run(coro):
+    """asyncio.run(), on a uvloop event loop when uvloop is installed."""
+    if uvloop is None:
+        return asyncio.run(coro)
+    if sys.version_info >= (3, 11):
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            return runner.run(coro)
+    uvloop.install()
+    return asyncio.run(coro)
+
+
+async def _run_once(providers_filter: list, warn_usd: float, timeout: float,
+                    max_per_host: int = MAX_PER_HOST) -> list:
+    """One-shot CLI run: check, then release the shared client."""
+    try:
+        return await run_checks(providers_filter, warn_usd, timeout, max_per_host=max_per_host)
+    finally:
+        await close_client()
+
+
+# ─────────────────────────────────────────────
+# Disk Cache
+# ─────────────────────────────────────────────
+
+def _write_atomic(path: Path, data: bytes):
+    """Write via a temp file and os.replace(), so readers never see a torn file."""
+    tmp = path.with_suffix(f"{path.suffix}.{os.getpid()}.tmp")
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def _key_fingerprint(provider_id: str) -> str:
+    """Short hash of the provider's API key, so a rotated key never hits an old entry."""
+    key = os.environ.get(PROVIDERS_CONFIG[provider_id]["env"], "").strip()
+    return hashlib.sha256(key.encode()).hexdigest()[:16]
+
+
+def load_disk_cache(provider_ids: list, warn_usd: float,
+                    ttl: Optional[float] = DISK_CACHE_TTL) -> dict:
+    """
+    Return {provider_id: result} for every provider with a fresh entry in CACHE_DIR.
+    Results carrying a balance expire after min(ttl, BALANCE_CACHE_TTL); ttl=None
+    ignores age and returns the last good result, for stale-on-error fallback.
+    """
+    now = time.time()
+    cached = {}
+    for pid in provider_ids:
+        path = CACHE_DIR / f"{pid}.json"
+        try:
+            if ttl is not None and now - path.stat().st_mtime >= ttl:
+                continue
+            entry = json.loads(path.read_bytes())
+            result = entry["result"]
+            if entry["warn_usd"] != warn_usd or entry["key"] != _key_fingerprint(pid):
+                continue
+            if ttl is not None:
+                max_age = min(ttl, BALANCE_CACHE_TTL) if result.get("balance") else ttl
+                if now - entry["ts"] >= max_age:
+                    continue
+            result["status"] = Status[result["status"]]
+        except (OSError, ValueError, KeyError, TypeError):
+            continue  # missing or unreadable entry is just a miss
+        cached[pid] = result
+    return cached
+
+
+def save_disk_cache(results: list, warn_usd: float):
+    """
+    Write each result to CACHE_DIR; ERROR and UNCONFIGURED results are never cached.
+    Entries are kept past their TTL as the last good result for load_disk_cache(ttl=None).
+    """
+    now = time.time()
+    try:
+        if not CACHE_DIR.exists():
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        for r in results:
+            if r["status"] in (Status.ERROR, Status.UNCONFIGURED):
+                continue
+            entry = {"ts": now, "warn_usd": warn_usd,
+                     "key": _key_fingerprint(r["provider_id"]), "result": _public(r)}
+            _write_atomic(CACHE_DIR / f"{r['provider_id']}.json", json.dumps(entry).encode())
+    except OSError:
+        pass  # caching is best-effort
+
+
 # ─────────────────────────────────────────────
 # Report Formatter
 # ─────────────────────────────────────────────
 
-STATUS_ICONS = {"OK": "✅", "WARNING": "⚠️ ", "ERROR": "❌", "UNCONFIGURED": "⚫"}
+STATUS_ICONS = {Status.OK: "✅", Status.WARNING: "⚠️ ", Status.ERROR: "❌", Status.UNCONFIGURED: "⚫"}
 WIDTH = 66
 
+# Fixed report chrome, built once rather than on every report
+_HR = "─" * WIDTH
+_DHR = "═" * WIDTH
+_SUB_HR = "   " + "─" * 40
+_BOX_TOP = "╔" + "═" * (WIDTH - 2) + "╗"
+_BOX_TITLE = "║" + "  🔍 OpenClaw API Status Report".ljust(WIDTH - 2) + "║"
+_BOX_BOTTOM = "╚" + "═" * (WIDTH - 2) + "╝"
+_WARN_PFX = "  • ⚠️  "
+_ERR_PFX = "  • ❌ "
+_INFO_PFX = "  • ℹ️  "
+
 
 def fmt_limit(val):
     if val is None:
@@ -670,52 +1024,53 @@ def fmt_limit(val):
     return f"{val:,}"
 
 
-def format_report(results: list, warn_usd: float) -> str:
+def iter_report(results: list, warn_usd: float) -> Iterator[str]:
+    """Yield the report line by line, for callers that write it out incrementally."""
     now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
-    lines = []
-
-    lines.append("╔" + "═" * (WIDTH - 2) + "╗")
-    lines.append(f"║  🔍 OpenClaw API Status Report{' ' * (WIDTH - 32)}║")
-    lines.append(f"║  Generated: {now}{' ' * (WIDTH - 14 - len(now))}║")
-    lines.append("╚" + "═" * (WIDTH - 2) + "╝")
-    lines.append("")
-
-    counts = {s: sum(1 for r in results if r["status"] == s)
-              for s in ("OK", "WARNING", "ERROR", "UNCONFIGURED")}
-
-    lines.append("📊 SUMMARY")
-    lines.append("─" * WIDTH)
-    lines.append(f"  Providers Checked:  {len(results)}")
-    lines.append(f"  ✅ Healthy:         {counts['OK']}")
-    lines.append(f"  ⚠️  Warnings:        {counts['WARNING']}")
-    lines.append(f"  ❌ Errors:          {counts['ERROR']}")
-    lines.append(f"  ⚫ Unconfigured:    {counts['UNCONFIGURED']}")
-    lines.append("")
-    lines.append("─" * WIDTH)
-    lines.append("PROVIDER DETAILS")
-    lines.append("─" * WIDTH)
+
+    counts = {s.name: sum(1 for r in results if r["status"] is s) for s in Status}
+
+    # Fixed-shape header and summary go out as one batch
+    yield from (
+        _BOX_TOP,
+        _BOX_TITLE,
+        "║  Generated: " + now.ljust(WIDTH - 14) + "║",
+        _BOX_BOTTOM,
+        "",
+        "📊 SUMMARY",
+        _HR,
+        f"  Providers Checked:  {len(results)}",
+        f"  ✅ Healthy:         {counts['OK']}",
+        f"  ⚠️  Warnings:        {counts['WARNING']}",
+        f"  ❌ Errors:          {counts['ERROR']}",
+        f"  ⚫ Unconfigured:    {counts['UNCONFIGURED']}",
+        "",
+        _HR,
+        "PROVIDER DETAILS",
+        _HR,
+    )
 
     for r in results:
         icon = STATUS_ICONS.get(r["status"], "?")
         warnings_str = f"  [{', '.join(r['warnings'])}]" if r["warnings"] else ""
-        lines.append(f"\n{icon} {r['provider'].upper()}{warnings_str}")
+        yield f"\n{icon} {r['provider'].upper()}{warnings_str}"
 
-        if r["status"] == "UNCONFIGURED":
-            lines.append(f"   {'─' * 40}")
+        if r["status"] is Status.UNCONFIGURED:
+            yield _SUB_HR
             for note in r["notes"]:
-                lines.append(f"   ℹ️  {note}")
+                yield f"   ℹ️  {note}"
             continue
 
-        if r["status"] == "ERROR":
-            lines.append(f"   Error: {r['error']}")
+        if r["status"] is Status.ERROR:
+            yield f"   Error: {r['error']}"
             if r.get("console_url"):
-                lines.append(f"   Console: {r['console_url']}")
+                yield f"   Console: {r['console_url']}"
             continue
 
-        lines.append(f"   {'─' * 40}")
+        yield _SUB_HR
 
         if r.get("tier"):
-            lines.append(f"   Tier:          {r['tier']}")
+            yield f"   Tier:          {r['tier']}"
 
         if r.get("balance"):
             b = r["balance"]
@@ -723,11 +1078,11 @@ def format_report(results: list, warn_usd: float) -> str:
             cur = b.get("currency", "USD")
             if amt is not None:
                 display = f"{cur} {amt:,.4f}"
-                usd_eq = b.get("usd_equivalent")
+                usd_eq = _to_usd(amt, cur)
                 if usd_eq and cur != "USD":
                     display += f"  (~${usd_eq:.2f} USD)"
                 btype = b.get("type", "")
-                lines.append(f"   Balance:       {display}  [{btype}]")
+                yield f"   Balance:       {display}  [{btype}]"
 
         lim = r.get("limits", {})
         rem = r.get("remaining", {})
@@ -738,98 +1093,174 @@ def format_report(results: list, warn_usd: float) -> str:
         t_rem = rem.get("tokens")
         reset = rem.get("resets_in_seconds")
 
-        if rpm or tpm:
-            if rpm:
+        if rpm is not None or tpm is not None:
+            if rpm is not None:
                 rem_str = f"  │  Remaining: {fmt_limit(r_rem)}" if r_rem is not None else ""
-                lines.append(f"   RPM Limit:     {fmt_limit(rpm)}{rem_str}")
-            if tpm:
+                yield f"   RPM Limit:     {fmt_limit(rpm)}{rem_str}"
+            if tpm is not None:
                 rem_str = f"  │  Remaining: {fmt_limit(t_rem)}" if t_rem is not None else ""
-                lines.append(f"   TPM Limit:     {fmt_limit(tpm)}{rem_str}")
-            if lim.get("input_tokens_per_minute"):
-                lines.append(f"   Input TPM:     {fmt_limit(lim['input_tokens_per_minute'])}"
-                             f"  │  Output TPM: {fmt_limit(lim.get('output_tokens_per_minute'))}")
+                yield f"   TPM Limit:     {fmt_limit(tpm)}{rem_str}"
+            if lim.get("input_tokens_per_minute") is not None:
+                yield (f"   Input TPM:     {fmt_limit(lim['input_tokens_per_minute'])}"
+                       f"  │  Output TPM: {fmt_limit(lim.get('output_tokens_per_minute'))}")
             if reset:
-                lines.append(f"   Resets in:     {reset}")
+                yield f"   Resets in:     {reset}"
 
         if r.get("usage"):
             u = r["usage"]
             cost = u.get("cost_usd")
             period = u.get("period", "")
             if cost is not None:
-                lines.append(f"   Usage ({period}): ${cost:.4f} USD")
+                yield f"   Usage ({period}): ${cost:.4f} USD"
 
         for note in r.get("notes", []):
-            lines.append(f"   ℹ️  {note}")
+            yield f"   ℹ️  {note}"
         if r.get("console_url") and r.get("notes"):
-            lines.append(f"   🔗 {r['console_url']}")
+            yield f"   🔗 {r['console_url']}"
 
     # Recommendations
-    recs = []
+    # One pass collects per-provider recs plus the providers for the summary lines
+    recs, no_billing, stale = [], [], []
     for r in results:
-        if r["status"] == "WARNING":
-            for w in r["warnings"]:
-                recs.append(f"  • ⚠️  {r['provider']}: {w}")
-        elif r["status"] == "ERROR":
-            recs.append(f"  • ❌ {r['provider']}: {r.get('error', 'Check configuration')}")
-
-    no_billing = [r["provider"] for r in results
-                  if r["status"] == "OK" and any("not available via API" in n or "Billing" in n
-                                                   for n in r.get("notes", []))]
+        st = r["status"]
+        prov = r["provider"]
+        if st is Status.WARNING:
+            recs.extend(_WARN_PFX + prov + ": " + w for w in r["warnings"])
+            if r.get("cache_stale"):
+                stale.append(prov)
+        elif st is Status.ERROR:
+            recs.append(_ERR_PFX + prov + ": " + (r.get("error") or "Check configuration"))
+        elif st is Status.OK and r.get("notes"):
+            for n in r["notes"]:
+                if "not available via API" in n or "Billing" in n:
+                    no_billing.append(prov)
+                    break
+
     if no_billing:
-        recs.append(f"  • ℹ️  {', '.join(no_billing)}: billing requires web console access")
+        recs.append(_INFO_PFX + ", ".join(no_billing) + ": billing requires web console access")
+    if stale:
+        recs.append(_WARN_PFX + ", ".join(stale) + ": live check failed — showing last cached result")
 
     if recs:
-        lines.append("")
-        lines.append("─" * WIDTH)
-        lines.append("💡 RECOMMENDATIONS")
-        lines.append("─" * WIDTH)
-        lines.extend(recs)
+        yield from ("", _HR, "💡 RECOMMENDATIONS", _HR)
+        yield from recs
+
+    yield from ("", _DHR)
+
 
-    lines.append("")
-    lines.append("═" * WIDTH)
-    return "\n".join(lines)
+def format_report(results: list, warn_usd: float) -> str:
+    return "\n".join(iter_report(results, warn_usd))
 
 
 # ─────────────────────────────────────────────
 # Entry Point
 # ─────────────────────────────────────────────
 
+async def _main(args: argparse.Namespace, providers_filter: list):
+    """CLI body, on one event loop so file writes run in threads while the report prints."""
+    wanted = [pid for pid in PROVIDERS_CONFIG if not providers_filter or pid in providers_filter]
+    cached = {} if args.no_cache else load_disk_cache(wanted, args.threshold, args.cache_ttl)
+    to_check = [p for p in wanted if p not in cached]
+    fresh = (await _run_once(to_check, args.threshold, args.timeout, args.max_per_host)
+             if to_check else [])
+    by_pid = {**cached, **{r["provider_id"]: r for r in fresh}}
+    failed = [r["provider_id"] for r in fresh if is_transient_error(r)]
+    if failed and not args.no_cache:
+        for pid, last_good in load_disk_cache(failed, args.threshold, ttl=None).items():
+            by_pid[pid] = mark_stale(last_good, by_pid[pid]["error"])
+    results = [by_pid[p] for p in wanted]
+    sort_results(results)
+
+    # With --json only the JSON file is saved, so the text report is never built
+    save_txt = args.save and not args.json and args.save_format != "json"
+    save_json = args.save and args.save_format != "txt"
+
+    # Disk writes are started in worker threads and awaited once stdout is done
+    writes, saved = [], []
+    if not args.no_cache:
+        writes.append(asyncio.create_task(asyncio.to_thread(save_disk_cache, fresh, args.threshold)))
+    if args.save:
+        save_dir = REPORTS_DIR
+        if not save_dir.exists():
+            save_dir.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    # Encode up front so each file is a single write; saved JSON is compact
+    if save_json:
+        data = results_to_json_bytes(results, indent=False)
+        if zstandard is not None:
+            json_path = save_dir / f"api-status-{timestamp}.json.zst"
+            data = zstandard.ZstdCompressor(level=SAVE_ZSTD_LEVEL).compress(data)
+        else:
+            json_path = save_dir / f"api-status-{timestamp}.json"
+        writes.append(asyncio.create_task(asyncio.to_thread(_write_atomic, json_path, data)))
+        saved.append(f"JSON saved to:   {json_path}")
+
+    report_lines = []
+    if args.json:
+        sys.stdout.buffer.write(results_to_json_bytes(results, newline=True))
+    else:
+        # Stream the report as it is generated, as UTF-8 straight to the byte buffer;
+        # only keep the lines if they are being saved
+        write = sys.stdout.buffer.write
+        flush = sys.stdout.buffer.flush if sys.stdout.line_buffering else None  # keep TTY streaming
+        for line in iter_report(results, args.threshold):
+            write((line + "\n").encode())
+            if flush:
+                flush()
+            if save_txt:
+                report_lines.append(line)
+
+    # The byte buffer is block-buffered even on a TTY: flush so the output is out before
+    # anything below goes to stderr
+    sys.stdout.buffer.flush()
+
+    if save_txt:
+        report_path = save_dir / f"api-status-{timestamp}.txt"
+        writes.append(asyncio.create_task(
+            asyncio.to_thread(_write_atomic, report_path, "\n".join(report_lines).encode())))
+        saved.insert(0, f"Report saved to: {report_path}")
+
+    await asyncio.gather(*writes)
+    if saved and not args.quiet:
+        sys.stderr.write("\n" + "\n".join(saved) + "\n")
+
+
 def main():
     parser = argparse.ArgumentParser(description="OpenClaw API Status Checker")
     parser.add_argument("--json", action="store_true", help="Output JSON only")
-    parser.add_argument("--providers", nargs="+", metavar="PROVIDER",
-                        help=f"Check specific providers only: {list(PROVIDERS_CONFIG.keys())}")
+    parser.add_argument("--providers", nargs="+", metavar="PROVIDER", help=_PROVIDERS_HELP)
     parser.add_argument("--save", action="store_true", help="Save report to ~/openclaw/reports/")
+    parser.add_argument("--save-format", choices=("both", "txt", "json"), default="both",
+                        help="Files written by --save (default: both; --json saves JSON only)")
+    parser.add_argument("--quiet", action="store_true", help="Don't print where --save wrote files")
     parser.add_argument("--threshold", type=float, default=DEFAULT_WARN_BALANCE_USD,
                         help=f"Low balance warning threshold in USD (default: {DEFAULT_WARN_BALANCE_USD})")
+    parser.add_argument("--timeout", type=float, default=PROVIDER_TIMEOUT, metavar="SECONDS",
+                        help=f"Per-provider check timeout in seconds (default: {PROVIDER_TIMEOUT})")
+    parser.add_argument("--max-per-host", type=int, default=MAX_PER_HOST, metavar="N",
+                        help=f"Max concurrent requests to any one host (default: {MAX_PER_HOST})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always query providers; don't read or write the on-disk cache")
+    parser.add_argument("--cache-ttl", type=float, default=DISK_CACHE_TTL, metavar="SECONDS",
+                        help=f"Reuse cached results younger than this (default: {DISK_CACHE_TTL}; "
+                             f"balances at most {BALANCE_CACHE_TTL})")
     args = parser.parse_args()
-
-    providers_filter = [p.lower() for p in args.providers] if args.providers else []
-    invalid = [p for p in providers_filter if p not in PROVIDERS_CONFIG]
+    if args.timeout <= 0:
+        parser.error("--timeout must be greater than 0")
+    if args.max_per_host < 1:
+        parser.error("--max-per-host must be at least 1")
+    if args.json and args.save_format == "txt":
+        parser.error("--save-format txt can't be combined with --json (which saves JSON only)")
+
+    lowered = [p.lower() for p in args.providers] if args.providers else []
+    invalid = [p for p in lowered if p not in _PROVIDERS_LC]
     if invalid:
         print(f"ERROR: Unknown providers: {invalid}", file=sys.stderr)
-        print(f"Valid providers: {list(PROVIDERS_CONFIG.keys())}", file=sys.stderr)
+        print("Valid providers: " + ", ".join(_PROVIDER_NAMES), file=sys.stderr)
         sys.exit(1)
+    providers_filter = [_PROVIDERS_LC[p] for p in lowered]
 
-    results = asyncio.run(run_checks(providers_filter, args.threshold))
-
-    if args.json:
-        print(json.dumps(results, indent=2))
-        return
-
-    report = format_report(results, args.threshold)
-    print(report)
-
-    if args.save:
-        save_dir = Path.home() / "openclaw" / "reports"
-        save_dir.mkdir(parents=True, exist_ok=True)
-        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        report_path = save_dir / f"api-status-{timestamp}.txt"
-        json_path = save_dir / f"api-status-{timestamp}.json"
-        report_path.write_text(report)
-        json_path.write_text(json.dumps(results, indent=2))
-        print(f"\nReport saved to: {report_path}", file=sys.stderr)
-        print(f"JSON saved to:   {json_path}", file=sys.stderr)
+    _asyncio_run(_main(args, providers_filter))
 
 
 if __name__ == "__main__":